@@ -0,0 +1,115 @@
+from time import monotonic
+from typing import Optional
+
+from cdm_client.torrent_client_adapter_base import (
+    TorrentClientAdapterBase,
+    TorrentRef,
+)
+
+
+class CachedTorrentClientAdapter(TorrentClientAdapterBase):
+    """Serve repeated status reads from one snapshot of the torrent client.
+
+    The snapshot lives until ``invalidate`` is called (once per cycle) or,
+    when ``ttl`` is set, until it is older than ``ttl`` seconds. Mutations
+    only mark the entries they affect as stale, those are re-read one by one
+    on the next status read. ``hits`` and ``misses`` count the reads since
+    the last ``reset_counters`` call.
+    """
+
+    def __init__(
+        self, adapter: TorrentClientAdapterBase, ttl: Optional[float] = None
+    ) -> None:
+        self._adapter = adapter
+        self._ttl = ttl
+        self._entries: dict[int, dict] = {}
+        self._stale_ids: set[int] = set()
+        self._complete = False
+        self._fetched_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self) -> bool:
+        if self._fetched_at is None:
+            return False
+        return self._ttl is None or monotonic() - self._fetched_at < self._ttl
+
+    def invalidate(self, torrent_id: Optional[int] = None) -> None:
+        if torrent_id is not None:
+            if self._entries.pop(torrent_id, None) is not None:
+                self._stale_ids.add(torrent_id)
+            return
+        self._entries = {}
+        self._stale_ids = set()
+        self._complete = False
+        self._fetched_at = None
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh_stale_entries(self) -> bool:
+        try:
+            for torrent_id in list(self._stale_ids):
+                self.misses += 1
+                self._entries[torrent_id] = self._adapter.get_status_by_id(torrent_id)
+                self._stale_ids.discard(torrent_id)
+        except Exception:
+            # The torrent may have been removed outside of cdm-client.
+            return False
+        return True
+
+    def get_status(self) -> list[dict]:
+        if self._complete and self._is_fresh() and self._refresh_stale_entries():
+            self.hits += 1
+        else:
+            self.misses += 1
+            status = self._adapter.get_status()
+            self._entries = {
+                status_entry["id"]: status_entry for status_entry in status
+            }
+            self._stale_ids = set()
+            self._complete = True
+            self._fetched_at = monotonic()
+        # Callers annotate the entries, so never hand out the cached dicts.
+        return [dict(status_entry) for status_entry in self._entries.values()]
+
+    def get_status_by_id(self, torrent_id: int) -> dict:
+        if not self._is_fresh():
+            self.invalidate()
+            self._fetched_at = monotonic()
+        if torrent_id in self._entries:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._entries[torrent_id] = self._adapter.get_status_by_id(torrent_id)
+            self._stale_ids.discard(torrent_id)
+        return dict(self._entries[torrent_id])
+
+    def add_torrent(
+        self, torrent: bytes, download_dir: str, paused: bool = False
+    ) -> Optional[TorrentRef]:
+        new_torrent = self._adapter.add_torrent(
+            torrent, download_dir=download_dir, paused=paused
+        )
+        if new_torrent is not None:
+            self._entries.pop(new_torrent.id, None)
+            self._stale_ids.add(new_torrent.id)
+        return new_torrent
+
+    def pause_torrent(self, torrent_id: int) -> None:
+        self.invalidate(torrent_id)
+        self._adapter.pause_torrent(torrent_id)
+
+    def resume_torrent(self, torrent_id: int) -> None:
+        self.invalidate(torrent_id)
+        self._adapter.resume_torrent(torrent_id)
+
+    def remove_torrent(self, torrent_id: int) -> None:
+        self._adapter.remove_torrent(torrent_id)
+        # A removed torrent simply drops out of the snapshot.
+        self._entries.pop(torrent_id, None)
+        self._stale_ids.discard(torrent_id)
+
+    def resolve_torrent_id(self, torrent_ref: str) -> int:
+        return self._adapter.resolve_torrent_id(torrent_ref)
@@ -1,15 +1,19 @@
 import logging
+import math
 import os
 import shutil
 from enum import Enum
 from logging.handlers import SysLogHandler
-from time import sleep
+from time import monotonic, sleep
 from typing import Optional
 
 import requests
 
+from cdm_client.cached_adapter import CachedTorrentClientAdapter
 from cdm_client.config import Config
 from cdm_client.database_adapter import DatabaseAdapter
+from cdm_client.download_scheduler import DownloadScheduler
+from cdm_client.notify import DEFAULT_SOCKET_PATH, NotificationListener
 from cdm_client.torrent_client_factory import (
     TorrentClientType,
     create_torrent_client_adapter,
@@ -27,16 +31,43 @@ class CDMClient:
     def __init__(self) -> None:
         self._logger = self._init_logger()
         self._config = Config()
-        self._torrent_client_adapter = create_torrent_client_adapter(
-            TorrentClientType.get_enum_from_value(self._config["client_type"]),
-            username=self._config["client_username"] or None,
-            password=self._config["client_password"] or None,
-            host=self._config["client_host"] or None,
-            port=int(self._config["client_port"])
-            if self._config["client_port"]
+        self._torrent_client_adapter = CachedTorrentClientAdapter(
+            create_torrent_client_adapter(
+                TorrentClientType.get_enum_from_value(self._config["client_type"]),
+                username=self._config["client_username"] or None,
+                password=self._config["client_password"] or None,
+                host=self._config["client_host"] or None,
+                port=int(self._config["client_port"])
+                if self._config["client_port"]
+                else None,
+            ),
+            ttl=float(self._config["status_cache_ttl"])
+            if self._config["status_cache_ttl"]
             else None,
         )
         self._database_adapter = DatabaseAdapter()
+        self._download_scheduler = DownloadScheduler(
+            int(self._config["max_active_downloads"])
+            if self._config["max_active_downloads"]
+            else None
+        )
+        self._poll_interval = self._get_poll_interval()
+        self._notification_listener = NotificationListener(
+            self._config["notify_socket"] or DEFAULT_SOCKET_PATH
+        )
+
+    def _get_poll_interval(self) -> float:
+        try:
+            poll_interval = float(self._config["poll_interval"] or 5)
+        except ValueError:
+            poll_interval = 0
+        if not math.isfinite(poll_interval) or poll_interval <= 0:
+            self._logger.warning(
+                "Invalid poll_interval %r, using 5 seconds",
+                self._config["poll_interval"],
+            )
+            return 5
+        return poll_interval
 
     def _init_logger(self) -> logging.Logger:
         syslog = SysLogHandler(address="/dev/log")
@@ -67,7 +98,7 @@ class CDMClient:
             )
             resp.raise_for_status()
             new_torrent = self._torrent_client_adapter.add_torrent(
-                resp.content, download_dir=path
+                resp.content, download_dir=path, paused=True
             )
             if new_torrent is None:
                 self._logger.error(
@@ -82,12 +113,45 @@ class CDMClient:
                     self._logger.error(
                         "Failed to save download-torrent mapping: %s", status
                     )
-            self._logger.info("Downloading torrent: %s to %s", tracker_id, path)
+                queued = db_adapter.enqueue_torrent(torrent_id=new_torrent.id)
+            if not queued:
+                # Nothing would ever start a paused torrent that is not queued.
+                self._logger.error(
+                    "Failed to queue torrent, starting it now: %s", new_torrent.id
+                )
+                self._torrent_client_adapter.resume_torrent(new_torrent.id)
+                continue
+            self._logger.info("Queued torrent: %s to %s", tracker_id, path)
+
+    def _admit_queued_downloads(self) -> None:
+        with self._database_adapter as db_adapter:
+            queued_torrent_ids = db_adapter.get_queued_torrent_ids()
+        if not queued_torrent_ids:
+            return
+        status_entries = self._torrent_client_adapter.get_status()
+        admissible = self._download_scheduler.get_admissible(
+            status_entries, queued_torrent_ids
+        )
+        for torrent_id in admissible:
+            self._torrent_client_adapter.resume_torrent(torrent_id)
+            self._logger.info("Started queued torrent: %s", torrent_id)
+        known_torrent_ids = {status_entry["id"] for status_entry in status_entries}
+        with self._database_adapter as db_adapter:
+            for torrent_id in queued_torrent_ids:
+                if torrent_id in admissible or torrent_id not in known_torrent_ids:
+                    db_adapter.dequeue_torrent(torrent_id=torrent_id)
 
     def _execute_instructions(self, instructions: list[dict]) -> None:
         for instruction in instructions:
             self._logger.info("Received instruction: %s", instruction)
             for action, params in instruction.items():
+                if action in (
+                    InstructionAction.STOP.value,
+                    InstructionAction.START.value,
+                ):
+                    # A manual stop or start takes the torrent out of the queue.
+                    with self._database_adapter as db_adapter:
+                        db_adapter.dequeue_torrent(torrent_id=params["torrent_id"])
                 if action == InstructionAction.STOP.value:
                     self._torrent_client_adapter.pause_torrent(params["torrent_id"])
                     self._logger.info("Stopped torrent: %s", params["torrent_id"])
@@ -125,6 +189,8 @@ class CDMClient:
             self._logger.warning("No clean paths provided")
             return
 
+        # Never decide what to delete from a cached status.
+        self._torrent_client_adapter.invalidate()
         status_entries = self._torrent_client_adapter.get_status()
         protected_paths: set[str] = set()
         for status_entry in status_entries:
@@ -168,6 +234,7 @@ class CDMClient:
         finally:
             with self._database_adapter as db_adapter:
                 deleted_mapping = db_adapter.delete_mapping(torrent_id=torrent_id)
+                db_adapter.dequeue_torrent(torrent_id=torrent_id)
             self._update_status(status_data)
 
         self._logger.info(
@@ -210,23 +277,76 @@ class CDMClient:
         else:
             status = self._torrent_client_adapter.get_status()
         with self._database_adapter as db_adapter:
+            queued_torrent_ids = set(db_adapter.get_queued_torrent_ids())
             for status_entry in status:
                 tracker_id = db_adapter.get_tracker_id_by_torrent_id(status_entry["id"])
                 if tracker_id:
                     status_entry["tracker_id"] = tracker_id
+                if (
+                    status_entry["id"] in queued_torrent_ids
+                    and status_entry["status"] == "stopped"
+                ):
+                    status_entry["status"] = "download pending"
                 if for_deletion:
                     status_entry["is_deleted"] = True
         return status
 
+    def _push_notified_status(self, torrent_refs: list[str]) -> None:
+        # The snapshot may be up to poll_interval old by now.
+        self._torrent_client_adapter.invalidate()
+        status_data = []
+        for torrent_ref in torrent_refs:
+            try:
+                torrent_id = self._torrent_client_adapter.resolve_torrent_id(
+                    torrent_ref
+                )
+                status_data.extend(self._get_download_status(torrent_id=torrent_id))
+            except Exception:
+                self._logger.exception(
+                    "Failed to get status of notified torrent: %s", torrent_ref
+                )
+        if status_data:
+            self._update_status(status_data)
+            self._logger.info(
+                "Pushed status of notified torrents: %s",
+                [status_entry["id"] for status_entry in status_data],
+            )
+        # A finished download frees a slot for the next queued torrent.
+        self._admit_queued_downloads()
+
+    def _wait_for_next_cycle(self) -> None:
+        deadline = monotonic() + self._poll_interval
+        while (remaining := deadline - monotonic()) > 0:
+            torrent_refs = self._notification_listener.wait(remaining)
+            if not torrent_refs:
+                continue
+            try:
+                self._push_notified_status(torrent_refs)
+            except Exception:
+                self._logger.exception("An error occurred.")
+
     def run(self) -> None:
         self._logger.info("Starting cdm-client...")
+        self._notification_listener.start()
         while True:
+            self._torrent_client_adapter.invalidate()
             try:
                 self._update_status(self._get_download_status())
                 self._get_order()
             except Exception:
                 self._logger.exception("An error occurred.")
-            sleep(5)
+            # Admission is local, keep freeing slots while the server is down.
+            try:
+                self._admit_queued_downloads()
+            except Exception:
+                self._logger.exception("An error occurred.")
+            self._logger.info(
+                "Status snapshot hits: %s, misses: %s",
+                self._torrent_client_adapter.hits,
+                self._torrent_client_adapter.misses,
+            )
+            self._torrent_client_adapter.reset_counters()
+            self._wait_for_next_cycle()
 
 
 def main() -> None:
@@ -18,6 +18,10 @@ class Config:
             "client_username": "",
             "client_password": "",
             "client_type": "",
+            "poll_interval": "5",
+            "notify_socket": "",
+            "status_cache_ttl": "",
+            "max_active_downloads": "",
         }
     }
     ENCRYPTED_CONFIG = ["rpc_password", "password"]
@@ -87,4 +91,6 @@ class Config:
                 )
                 self._write_creds()
                 return raw_value
-        return self._config["connection"][name]
+        return self._config["connection"].get(
+            name, self.DEFAULT_CONFIG["connection"].get(name, "")
+        )
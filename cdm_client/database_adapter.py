@@ -26,6 +26,17 @@ class DownloadTorrentMapping(Base):
     )
 
 
+class QueuedDownload(Base):
+    __tablename__ = "queued_download"
+
+    position: int = Column(  # type: ignore[assignment]
+        Integer, primary_key=True, autoincrement=True
+    )
+    torrent_id: int = Column(  # type: ignore[assignment]
+        Integer, nullable=False, unique=True
+    )
+
+
 class DatabaseAdapter:
     DATABASE_PATH = os.path.join(
         os.path.expanduser("~"), ".local", "share", "cdm_client", "cdm_client.db"
@@ -98,6 +109,37 @@ class DatabaseAdapter:
         )
         return mapping.tracker_id if mapping else None
 
+    def enqueue_torrent(self, torrent_id: int) -> bool:
+        if torrent_id in self.get_queued_torrent_ids():
+            return True
+        try:
+            self.session.add(QueuedDownload(torrent_id=torrent_id))
+            self.session.commit()
+            return True
+        except IntegrityError:
+            self.session.rollback()
+            return False
+        except Exception:
+            self.session.rollback()
+            return False
+
+    def get_queued_torrent_ids(self) -> list[int]:
+        queued_downloads = (
+            self.session.query(QueuedDownload).order_by(QueuedDownload.position).all()
+        )
+        return [queued_download.torrent_id for queued_download in queued_downloads]
+
+    def dequeue_torrent(self, torrent_id: int) -> bool:
+        queued_download = (
+            self.session.query(QueuedDownload).filter_by(torrent_id=torrent_id).first()
+        )
+
+        if queued_download:
+            self.session.delete(queued_download)
+            self.session.commit()
+            return True
+        return False
+
     def delete_mapping(self, torrent_id: int) -> bool:
         mapping = (
             self.session.query(DownloadTorrentMapping)
@@ -0,0 +1,128 @@
+import logging
+import os
+from typing import Optional
+
+ACTIVE_STATUSES = {"check pending", "checking", "download pending", "downloading"}
+
+
+class DownloadScheduler:
+    """Decide which queued torrents may start downloading.
+
+    Queued torrents are added paused and started in server order as long as
+    there is a free download slot and their remaining size fits on the
+    filesystem of their download directory. Torrents that do not fit even
+    on an otherwise idle filesystem are skipped, so they do not block the
+    queue, and are started once enough space is freed.
+    """
+
+    def __init__(self, max_active_downloads: Optional[int] = None) -> None:
+        self._max_active_downloads = max_active_downloads
+        self._waiting_for_space: set[int] = set()
+        self._oversized: set[int] = set()
+        self._logger = logging.getLogger("cdm-client")
+
+    def _get_remaining_size(self, status_entry: dict) -> int:
+        total_size = status_entry.get("totalSize") or 0
+        progress = status_entry.get("progress") or 0
+        return int(total_size * (100 - progress) / 100)
+
+    def _get_existing_path(self, download_dir: str) -> Optional[str]:
+        # The torrent client creates the download directory on start, so
+        # check the filesystem of its nearest existing parent.
+        path = os.path.abspath(download_dir)
+        while not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+        return path
+
+    def _get_device(self, download_dir: str) -> Optional[int]:
+        path = self._get_existing_path(download_dir)
+        if path is None:
+            return None
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            return None
+
+    def _get_free_space(self, download_dir: str) -> int:
+        stat = os.statvfs(self._get_existing_path(download_dir) or download_dir)
+        return stat.f_bavail * stat.f_frsize
+
+    def get_admissible(
+        self, status_entries: list[dict], queued_torrent_ids: list[int]
+    ) -> list[int]:
+        queued = set(queued_torrent_ids)
+        status_by_id = {
+            status_entry["id"]: status_entry for status_entry in status_entries
+        }
+        active_entries = [
+            status_entry
+            for status_entry in status_entries
+            if status_entry["id"] not in queued
+            and status_entry.get("status") in ACTIVE_STATUSES
+            and (status_entry.get("progress") or 0) < 100
+        ]
+
+        total_free_space: dict[int, int] = {}
+        free_space: dict[int, int] = {}
+
+        def get_device(status_entry: dict) -> Optional[int]:
+            device = self._get_device(status_entry["downloadDir"])
+            if device is not None and device not in total_free_space:
+                total_free_space[device] = self._get_free_space(
+                    status_entry["downloadDir"]
+                )
+                free_space[device] = total_free_space[device]
+            return device
+
+        for status_entry in active_entries:
+            device = get_device(status_entry)
+            if device is not None:
+                free_space[device] -= self._get_remaining_size(status_entry)
+
+        slots = (
+            self._max_active_downloads - len(active_entries)
+            if self._max_active_downloads is not None
+            else None
+        )
+        admissible = []
+        for torrent_id in queued_torrent_ids:
+            if slots is not None and slots <= 0:
+                break
+            status_entry = status_by_id.get(torrent_id)
+            if status_entry is None:
+                continue
+            device = get_device(status_entry)
+            if device is not None:
+                remaining_size = self._get_remaining_size(status_entry)
+                if remaining_size > total_free_space[device]:
+                    if torrent_id not in self._oversized:
+                        self._logger.error(
+                            "Torrent %s needs %s bytes but only %s are free in %s",
+                            torrent_id,
+                            remaining_size,
+                            total_free_space[device],
+                            status_entry["downloadDir"],
+                        )
+                    self._oversized.add(torrent_id)
+                    continue
+                self._oversized.discard(torrent_id)
+                if remaining_size > free_space[device]:
+                    if torrent_id not in self._waiting_for_space:
+                        self._logger.info(
+                            "Not enough free space to start torrent %s in %s yet",
+                            torrent_id,
+                            status_entry["downloadDir"],
+                        )
+                    self._waiting_for_space.add(torrent_id)
+                    break
+                free_space[device] -= remaining_size
+            self._waiting_for_space.discard(torrent_id)
+            admissible.append(torrent_id)
+            if slots is not None:
+                slots -= 1
+        self._waiting_for_space &= queued
+        self._oversized &= queued
+        return admissible
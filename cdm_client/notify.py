@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Only the standard library may be used here: this file is also installed
+# as a standalone script for torrent daemons running as another user.
+import argparse
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+from typing import Optional
+
+DEFAULT_SOCKET_PATH = "/tmp/cdm-client.sock"
+
+
+class _NotificationHandler(socketserver.StreamRequestHandler):
+    server: "_NotificationServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            torrent_ref = line.decode(errors="replace").strip()
+            if torrent_ref:
+                self.server.notifications.put(torrent_ref)
+
+
+class _NotificationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, notifications: "queue.Queue[str]") -> None:
+        self.notifications = notifications
+        super().__init__(socket_path, _NotificationHandler)
+
+
+class NotificationListener:
+    """Receive torrent completion notifications on a local Unix socket.
+
+    The torrent daemon runs ``cdm-client-notify`` when a torrent finishes,
+    which writes the torrent reference to the socket. The listener only
+    queues the references, the main loop decides what to do with them.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+        self._socket_path = socket_path
+        self._notifications: "queue.Queue[str]" = queue.Queue()
+        self._server: Optional[_NotificationServer] = None
+        self._logger = logging.getLogger("cdm-client")
+
+    def _is_socket_in_use(self) -> bool:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self._socket_path)
+            except OSError:
+                return False
+        return True
+
+    def start(self) -> bool:
+        if os.path.exists(self._socket_path) and self._is_socket_in_use():
+            self._logger.error(
+                "Notification socket %s is used by another process", self._socket_path
+            )
+            return False
+        try:
+            if os.path.exists(self._socket_path):
+                # Left behind by a previous run that did not shut down cleanly.
+                os.remove(self._socket_path)
+            self._server = _NotificationServer(self._socket_path, self._notifications)
+            # The torrent daemon usually runs as a different user.
+            os.chmod(self._socket_path, 0o666)
+        except OSError:
+            self._logger.exception(
+                "Failed to listen for notifications on %s", self._socket_path
+            )
+            return False
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._logger.info("Listening for notifications on %s", self._socket_path)
+        return True
+
+    def wait(self, timeout: float) -> list[str]:
+        """Block until a notification arrives or the timeout expires."""
+        try:
+            torrent_refs = [self._notifications.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                torrent_refs.append(self._notifications.get_nowait())
+            except queue.Empty:
+                return torrent_refs
+
+
+def send_notification(torrent_ref: str, socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        sock.sendall(f"{torrent_ref}\n".encode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="cdm-client-notify",
+        description="Notify the running cdm-client that a torrent has finished.",
+    )
+    parser.add_argument(
+        "torrent",
+        nargs="?",
+        default=os.environ.get("TR_TORRENT_ID"),
+        help="torrent id or info hash (defaults to $TR_TORRENT_ID)",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("CDM_CLIENT_SOCKET", DEFAULT_SOCKET_PATH),
+        help=f"path of the cdm-client socket (default: {DEFAULT_SOCKET_PATH})",
+    )
+    args = parser.parse_args()
+    if not args.torrent:
+        parser.error("no torrent given and $TR_TORRENT_ID is not set")
+    try:
+        send_notification(args.torrent, socket_path=args.socket)
+    except OSError as e:
+        print(f"cdm-client-notify: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,12 @@ class QBitTorrentAdapter(TorrentClientAdapterBase):
         """Convert torrent hash to integer ID using Python's hash function."""
         return int(torrent_hash[:8], 16)
 
+    def resolve_torrent_id(self, torrent_ref: str) -> int:
+        """Accept the info hash passed by qBittorrent's external program hook."""
+        if len(torrent_ref) in (40, 64):
+            return self._hash_to_id(torrent_ref)
+        return int(torrent_ref)
+
     def _map_status(self, qbittorrent_status: TorrentState) -> str:
         status_mapping = {
             TorrentState.ERROR: "stopped",
@@ -52,7 +58,8 @@ class QBitTorrentAdapter(TorrentClientAdapterBase):
             TorrentState.STOPPED_DOWNLOAD: "stopped",
             TorrentState.QUEUED_DOWNLOAD: "download pending",
             TorrentState.FORCED_DOWNLOAD: "downloading",
-            TorrentState.STALLED_DOWNLOAD: "stopped",
+            # Still downloading, just waiting for peers
+            TorrentState.STALLED_DOWNLOAD: "downloading",
             TorrentState.CHECKING_DOWNLOAD: "checking",
             TorrentState.CHECKING_RESUME_DATA: "checking",
             TorrentState.MOVING: "checking",
@@ -98,11 +105,16 @@ class QBitTorrentAdapter(TorrentClientAdapterBase):
         return torrents[-1] if len(torrents) > 0 else None
 
     def add_torrent(
-        self, torrent: bytes, download_dir: str
+        self, torrent: bytes, download_dir: str, paused: bool = False
     ) -> Optional[TorrentWrapper]:
         states_before = self._client.torrents_info()
         self._client.torrents_add(
-            torrent_files=torrent, save_path=download_dir, is_sequential_download=True
+            torrent_files=torrent,
+            save_path=download_dir,
+            is_sequential_download=True,
+            # qBittorrent 5 renamed "paused" to "stopped"
+            is_paused=paused,
+            is_stopped=paused,
         )
         for _ in range(20):  # Wait up to 10 seconds
             if self._client.torrents_info() == states_before:
@@ -19,7 +19,7 @@ class TorrentClientAdapterBase(ABC):
 
     @abstractmethod
     def add_torrent(
-        self, torrent: bytes, download_dir: str
+        self, torrent: bytes, download_dir: str, paused: bool = False
     ) -> Optional[TorrentRef]: ...
 
     @abstractmethod
@@ -30,3 +30,6 @@ class TorrentClientAdapterBase(ABC):
 
     @abstractmethod
     def remove_torrent(self, torrent_id: int) -> None: ...
+
+    def resolve_torrent_id(self, torrent_ref: str) -> int:
+        return int(torrent_ref)
@@ -45,8 +45,12 @@ class TransmissionAdapter(TorrentClientAdapterBase):
         torrent = self._client.get_torrent(torrent_id)
         return self._get_status_dict(torrent)
 
-    def add_torrent(self, torrent: bytes, download_dir: str) -> Torrent:
-        return self._client.add_torrent(torrent, download_dir=download_dir)
+    def add_torrent(
+        self, torrent: bytes, download_dir: str, paused: bool = False
+    ) -> Torrent:
+        return self._client.add_torrent(
+            torrent, download_dir=download_dir, paused=paused
+        )
 
     def pause_torrent(self, torrent_id: int) -> None:
         return self._client.stop_torrent(ids=[torrent_id])